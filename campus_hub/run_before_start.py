@@ -1,14 +1,53 @@
 # campus_hub/run_before_start.py
 
+import hashlib
 import os
+from pathlib import Path
+
 import django
 from django.core.management import call_command
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "campus_hub.settings")
 django.setup()
 
+from django.conf import settings  # noqa: E402
+from django.contrib.staticfiles.finders import get_finders  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.migrations.executor import MigrationExecutor  # noqa: E402
+
+# Fingerprint of the static sources that were last collected
+STATIC_SIGNATURE_FILE = ".collect.sig"
+
+
+def has_unapplied_migrations() -> bool:
+    """Return True if the database is behind the migration graph."""
+    executor = MigrationExecutor(connection)
+    targets = executor.loader.graph.leaf_nodes()
+    return bool(executor.migration_plan(targets))
+
+
+def static_fingerprint() -> str:
+    """Hash the path, size and mtime of every file collectstatic would copy."""
+    entries = []
+    for finder in get_finders():
+        for path, storage in finder.list([]):
+            stat = os.stat(storage.path(path))
+            entries.append(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}")
+
+    digest = hashlib.blake2b()
+    for entry in sorted(entries):
+        digest.update(entry.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
 # Run DB migrations
-call_command("migrate", interactive=False)
+if has_unapplied_migrations():
+    call_command("migrate", interactive=False)
 
-# Collect static files
-call_command("collectstatic", interactive=False)
+# Collect static files, unless the sources are unchanged since the last run
+signature_path = Path(settings.STATIC_ROOT) / STATIC_SIGNATURE_FILE
+fingerprint = static_fingerprint()
+if not signature_path.exists() or signature_path.read_text() != fingerprint:
+    call_command("collectstatic", interactive=False)
+    signature_path.write_text(fingerprint)
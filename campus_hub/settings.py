@@ -85,7 +85,9 @@ DATABASES = {
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '3306'),
         'OPTIONS': {
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+            # db_default=Now() is evaluated by MySQL in the session time zone;
+            # keep it in UTC like the values Django writes itself
+            'init_command': "SET sql_mode='STRICT_TRANS_TABLES', time_zone='+00:00'",
         },
     }
 }
@@ -1,13 +1,129 @@
 """
 Admin configuration for core app models.
 """
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
 from .models import (
     User, Department, Faculty, StudyMaterial,
     UploadAudit, TimetableEntry, Notification, Coordinator, SearchQueryLog,
     UserFavoriteMaterial, RecentlyViewedMaterial
 )
+from .cache import invalidate_recent_materials
+from .paginators import EstimatedCountPaginator, KeysetPaginator
+
+
+# Cached sidebar filters list at most this many choices and reload them
+# after this many seconds.
+LIST_FILTER_CHOICES_LIMIT = 200
+LIST_FILTER_CACHE_TIMEOUT = 300
+
+
+class CachedRelatedListFilter(admin.SimpleListFilter):
+    """
+    Sidebar filter for a foreign key whose choices come from the cache.
+
+    The stock related-field filter loads the whole related table on every
+    changelist request; this one lists a bounded set of (pk, name) pairs
+    and reuses it across requests.
+    """
+    related_model = None
+    label_field = 'name'
+    # Choice offered for rows without a related object, on nullable keys only
+    empty_value = '__empty__'
+    empty_label = None
+
+    def lookups(self, request, model_admin):
+        cache_key = f'admin_list_filter:{self.related_model._meta.label_lower}'
+        choices = cache.get_or_set(cache_key, self.load_choices, LIST_FILTER_CACHE_TIMEOUT)
+        if self.is_nullable(model_admin.model):
+            label = self.empty_label or model_admin.get_empty_value_display()
+            choices = [*choices, (self.empty_value, label)]
+        return choices
+
+    def is_nullable(self, model) -> bool:
+        """Whether the filtered foreign key on ``model`` allows NULL."""
+        return model._meta.get_field(self.parameter_name).null
+
+    def load_choices(self) -> list:
+        """Load the filter choices from the database."""
+        choices = self.related_model.objects.order_by(self.label_field).values_list(
+            'pk', self.label_field
+        )
+        return list(choices[:LIST_FILTER_CHOICES_LIMIT])
+
+    def queryset(self, request, queryset):
+        if self.value() == self.empty_value and self.is_nullable(queryset.model):
+            return queryset.filter(**{f'{self.parameter_name}__isnull': True})
+        if self.value():
+            # Bad values redirect to ?e=1 like the stock related-field filter
+            try:
+                return queryset.filter(**{f'{self.parameter_name}_id': self.value()})
+            except (ValueError, ValidationError) as e:
+                raise IncorrectLookupParameters(e)
+        return queryset
+
+
+class CachedUserFilter(CachedRelatedListFilter):
+    """Cached sidebar filter on a ``user`` foreign key."""
+    title = 'user'
+    parameter_name = 'user'
+    related_model = User
+    empty_label = 'Anonymous'
+
+
+class CachedInstructorFilter(CachedRelatedListFilter):
+    """Cached sidebar filter on a timetable entry's instructor."""
+    title = 'instructor'
+    parameter_name = 'instructor'
+    related_model = Faculty
+
+
+class ListColumnsChangeList(ChangeList):
+    """ChangeList that loads only the columns its admin declares for the list."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        if self.model_admin.list_only_fields:
+            qs = qs.only(*self.model_admin.list_only_fields)
+        if self.model_admin.list_defer_fields:
+            qs = qs.defer(*self.model_admin.list_defer_fields)
+        return qs
+
+
+class ListColumnsMixin:
+    """
+    Restrict changelist queries to ``list_only_fields`` or away from
+    ``list_defer_fields``; change views keep loading full rows.
+    """
+    list_only_fields = ()
+    list_defer_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        return ListColumnsChangeList
+
+
+class RawIdLookupMixin:
+    """
+    Validate raw-id user and material foreign keys against narrow querysets
+    that load just the columns their ``__str__`` needs.
+    """
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.raw_id_fields and 'queryset' not in kwargs:
+            related_model = db_field.remote_field.model
+            if related_model is User:
+                kwargs['queryset'] = User.objects.only('id', 'name', 'email')
+            elif related_model is StudyMaterial:
+                kwargs['queryset'] = StudyMaterial.objects.select_related('department').only(
+                    'id', 'title', 'department__short_code'
+                )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
 @admin.register(User)
@@ -38,20 +154,26 @@ class DepartmentAdmin(admin.ModelAdmin):
     list_filter = ['created_at']
     search_fields = ['name', 'short_code']
     ordering = ['name']
+    readonly_fields = ['created_at']
 
 
 @admin.register(Faculty)
-class FacultyAdmin(admin.ModelAdmin):
+class FacultyAdmin(ListColumnsMixin, admin.ModelAdmin):
     """Admin configuration for Faculty model."""
     list_display = ['name', 'title', 'department', 'status', 'contact_email']
     list_filter = ['department', 'status']
     search_fields = ['name', 'title', 'contact_email']
     ordering = ['name']
     raw_id_fields = ['department']
+    list_select_related = ['department']
+    list_only_fields = [
+        'name', 'title', 'status', 'contact_email',
+        'department__name', 'department__short_code'
+    ]
 
 
 @admin.register(StudyMaterial)
-class StudyMaterialAdmin(admin.ModelAdmin):
+class StudyMaterialAdmin(ListColumnsMixin, RawIdLookupMixin, admin.ModelAdmin):
     """Admin configuration for StudyMaterial model."""
     list_display = [
         'title', 'department', 'downloads_count', 'views_count',
@@ -61,26 +183,74 @@ class StudyMaterialAdmin(admin.ModelAdmin):
         'department', 'file_type', 'verification_status',
         'semester', 'year', 'uploaded_at'
     ]
-    search_fields = ['title', 'description', 'uploader_user__name', 'uploader_user__email']
+    search_fields = ['title', 'description', '^uploader_user__name', '=uploader_user__email']
     ordering = ['-uploaded_at']
     raw_id_fields = ['department', 'uploader_user', 'verifier']
-    readonly_fields = ['uploaded_at', 'verified_at', 'downloads_count', 'views_count', 'thumbs_up_count', 'favorites_count']
+    readonly_fields = ['uploaded_at', 'verified_at', 'downloads_count', 'views_count', 'thumbs_up_count', 'favorites_count', 'total_engagement']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_only_fields = [
+        'title', 'downloads_count', 'views_count', 'verification_status', 'uploaded_at',
+        'department__name', 'department__short_code', 'uploader_user__name'
+    ]
+    actions = ['approve_selected', 'reject_selected']
     
     def get_queryset(self, request):
         """Optimize queryset for admin."""
         qs = super().get_queryset(request)
         return qs.select_related('department', 'uploader_user')
 
+    @admin.action(description='Approve selected study materials', permissions=['change'])
+    def approve_selected(self, request, queryset):
+        self._moderate_selected(request, queryset, 'approve', 'approved')
+
+    @admin.action(description='Reject selected study materials', permissions=['change'])
+    def reject_selected(self, request, queryset):
+        self._moderate_selected(request, queryset, 'reject', 'rejected')
+
+    def _moderate_selected(self, request, queryset, action, status):
+        """Set the verification status of the selection with one UPDATE and one bulk INSERT of audits."""
+        # Resolve the ids first: the changelist may be filtered on the status being changed
+        material_ids = list(queryset.values_list('pk', flat=True))
+        with transaction.atomic():
+            StudyMaterial.objects.filter(pk__in=material_ids).update(
+                verification_status=status,
+                verifier=request.user,
+                verified_at=timezone.now(),
+            )
+            UploadAudit.objects.bulk_create(
+                [
+                    UploadAudit(
+                        material_id=material_id,
+                        uploader=request.user,
+                        action='edit',
+                        reason=f'Moderation action: {action}',
+                    )
+                    for material_id in material_ids
+                ],
+                batch_size=500,
+            )
+        # update() sends no post_save, so clear the home page list here
+        invalidate_recent_materials()
+        self.message_user(
+            request,
+            f'{len(material_ids)} study material(s) marked as {status}.',
+            messages.SUCCESS,
+        )
+
 
 @admin.register(UploadAudit)
-class UploadAuditAdmin(admin.ModelAdmin):
+class UploadAuditAdmin(RawIdLookupMixin, admin.ModelAdmin):
     """Admin configuration for UploadAudit model."""
     list_display = ['material', 'uploader', 'action', 'timestamp']
     list_filter = ['action', 'timestamp']
     search_fields = ['material__title', 'uploader__name', 'uploader__email', 'reason']
     ordering = ['-timestamp']
     raw_id_fields = ['material', 'uploader']
+    list_select_related = ['material', 'material__department', 'uploader']
     readonly_fields = ['timestamp']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 @admin.register(TimetableEntry)
@@ -90,14 +260,15 @@ class TimetableEntryAdmin(admin.ModelAdmin):
         'course_code', 'course_name', 'department', 'semester',
         'date', 'start_time', 'end_time', 'venue', 'instructor'
     ]
-    list_filter = ['department', 'semester', 'date', 'instructor']
+    list_filter = ['department', 'semester', 'date', CachedInstructorFilter]
     search_fields = ['course_code', 'course_name', 'venue', 'instructor__name']
     ordering = ['date', 'start_time']
     raw_id_fields = ['department', 'instructor']
+    list_select_related = ['department', 'instructor', 'instructor__department']
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(ListColumnsMixin, RawIdLookupMixin, admin.ModelAdmin):
     """Admin configuration for Notification model."""
     list_display = [
         'title', 'department', 'created_by', 'sent_status',
@@ -107,51 +278,64 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ['title', 'body', 'created_by__name', 'created_by__email']
     ordering = ['-created_at']
     raw_id_fields = ['department', 'created_by']
+    list_select_related = ['department', 'created_by']
     readonly_fields = ['created_at']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_defer_fields = ['body']
 
 
 @admin.register(Coordinator)
-class CoordinatorAdmin(admin.ModelAdmin):
+class CoordinatorAdmin(RawIdLookupMixin, admin.ModelAdmin):
     """Admin configuration for Coordinator model."""
     list_display = ['user', 'department', 'role', 'contact_info']
     list_filter = ['department', 'role']
     search_fields = ['user__name', 'user__email', 'department__name', 'contact_info']
-    ordering = ['department', 'role', 'user']
+    ordering = ['department__name', 'role', 'user__name']
     raw_id_fields = ['user', 'department']
+    list_select_related = ['user', 'department']
 
 
 @admin.register(SearchQueryLog)
-class SearchQueryLogAdmin(admin.ModelAdmin):
+class SearchQueryLogAdmin(ListColumnsMixin, RawIdLookupMixin, admin.ModelAdmin):
     """Admin configuration for SearchQueryLog model."""
     list_display = ['query', 'user', 'timestamp']
-    list_filter = ['timestamp', 'user']
+    list_filter = ['timestamp', CachedUserFilter]
     search_fields = ['query', 'user__name', 'user__email']
     ordering = ['-timestamp']
     raw_id_fields = ['user']
+    list_select_related = ['user']
+    list_only_fields = ['query', 'timestamp', 'user__name', 'user__email']
     readonly_fields = ['timestamp']
     date_hierarchy = 'timestamp'
+    show_full_result_count = False
+    paginator = KeysetPaginator
 
 
 @admin.register(UserFavoriteMaterial)
-class UserFavoriteMaterialAdmin(admin.ModelAdmin):
+class UserFavoriteMaterialAdmin(RawIdLookupMixin, admin.ModelAdmin):
     """Admin configuration for UserFavoriteMaterial model."""
     list_display = ['user', 'material', 'created_at']
     list_filter = ['created_at']
     search_fields = ['user__name', 'user__email', 'material__title']
     ordering = ['-created_at']
     raw_id_fields = ['user', 'material']
+    list_select_related = ['user', 'material', 'material__department']
     readonly_fields = ['created_at']
     date_hierarchy = 'created_at'
 
 
 @admin.register(RecentlyViewedMaterial)
-class RecentlyViewedMaterialAdmin(admin.ModelAdmin):
+class RecentlyViewedMaterialAdmin(RawIdLookupMixin, admin.ModelAdmin):
     """Admin configuration for RecentlyViewedMaterial model."""
     list_display = ['user', 'material', 'last_viewed_at']
-    list_filter = ['last_viewed_at', 'user']
+    list_filter = ['last_viewed_at', CachedUserFilter]
     search_fields = ['user__name', 'user__email', 'material__title']
     ordering = ['-last_viewed_at']
     raw_id_fields = ['user', 'material']
+    list_select_related = ['user', 'material', 'material__department']
     readonly_fields = ['last_viewed_at']
     date_hierarchy = 'last_viewed_at'
+    show_full_result_count = False
+    paginator = KeysetPaginator
 
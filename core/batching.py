@@ -0,0 +1,84 @@
+"""
+Batched background writes for core app.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """
+    Buffer unsaved model instances and bulk_create them from a daemon thread.
+
+    A batch is written once ``batch_size`` rows are waiting or ``interval``
+    seconds after its first row arrived, whichever comes first. Rows still
+    queued when the process exits are flushed synchronously.
+    """
+
+    def __init__(self, model, batch_size: int = 500, interval: float = 0.1):
+        self.model = model
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def add(self, obj) -> None:
+        """Queue an unsaved instance for the next batch."""
+        self._ensure_running()
+        self._queue.put(obj)
+
+    def flush(self) -> None:
+        """Write everything currently queued from the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+    def _ensure_running(self) -> None:
+        # Also restarts the writer in a forked worker, where the thread is gone
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"{self.model._meta.label}-batch-writer",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch) -> None:
+        # Treat each batch like a request so stale connections get recycled
+        close_old_connections()
+        try:
+            self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+        except Exception:
+            logger.exception("Dropped %d %s rows", len(batch), self.model._meta.label)
+        finally:
+            close_old_connections()
@@ -0,0 +1,89 @@
+"""
+Cached queries for core app.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import Department, SearchQueryLog, StudyMaterial
+
+
+# The cache is per process unless a shared backend is configured, so other
+# workers pick up a change at the latest when their entry expires.
+DEPARTMENTS_CACHE_KEY = "departments_all"
+DEPARTMENTS_CACHE_TIMEOUT = 300
+
+# Rankings move slowly, so a few minutes of staleness is accepted instead
+# of invalidating on every view, download and favorite.
+TOP_MATERIALS_CACHE_KEY = "top_materials_20"
+TOP_MATERIALS_CACHE_TIMEOUT = 300
+
+RECENT_MATERIALS_CACHE_KEY = "home_recent_5_approved"
+RECENT_MATERIALS_CACHE_TIMEOUT = 300
+
+SEARCH_TOP_TERMS_CACHE_KEY = "search_top_50"
+SEARCH_TOP_TERMS_CACHE_TIMEOUT = 600
+
+
+def get_departments_cached() -> list:
+    """Return all departments ordered by name, cached until one changes."""
+    return cache.get_or_set(
+        DEPARTMENTS_CACHE_KEY,
+        lambda: list(Department.objects.order_by("name")),
+        DEPARTMENTS_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_departments() -> None:
+    """Drop the cached department list."""
+    cache.delete(DEPARTMENTS_CACHE_KEY)
+
+
+def recent_materials_queryset():
+    """Return the newest materials with the columns the home page renders."""
+    return StudyMaterial.objects.select_related("department").only(
+        "title", "semester", "uploaded_at", "department__short_code",
+    ).order_by("-uploaded_at")
+
+
+def get_recent_approved_materials() -> list:
+    """Return the five newest approved materials, cached until one changes."""
+    return cache.get_or_set(
+        RECENT_MATERIALS_CACHE_KEY,
+        lambda: list(recent_materials_queryset().filter(verification_status="approved")[:5]),
+        RECENT_MATERIALS_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_recent_materials() -> None:
+    """Drop the cached home page material list."""
+    cache.delete(RECENT_MATERIALS_CACHE_KEY)
+
+
+def get_top_materials_cached() -> list:
+    """Return the 20 most engaged-with materials, favorites weighted 2x."""
+    return cache.get_or_set(
+        TOP_MATERIALS_CACHE_KEY, _load_top_materials, TOP_MATERIALS_CACHE_TIMEOUT
+    )
+
+
+def _load_top_materials() -> list:
+    queryset = StudyMaterial.objects.select_related("department").only(
+        "title", "views_count", "downloads_count", "favorites_count",
+        "department__short_code",
+    ).order_by("-total_engagement", "-downloads_count", "-views_count", "-favorites_count")
+    return list(queryset[:20])
+
+
+def get_search_top_terms_cached() -> list:
+    """Return the 50 most searched queries with their count and last use."""
+    return cache.get_or_set(
+        SEARCH_TOP_TERMS_CACHE_KEY, _load_search_top_terms, SEARCH_TOP_TERMS_CACHE_TIMEOUT
+    )
+
+
+def _load_search_top_terms() -> list:
+    queryset = SearchQueryLog.objects.values("query").annotate(
+        count=Count("id"),
+        last_searched=Max("timestamp"),
+    ).order_by("-count", "-last_searched")
+    return list(queryset[:50])
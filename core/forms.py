@@ -1,10 +1,16 @@
 """
 Forms for core app.
 """
+import re
+
 from django import forms
 from .models import StudyMaterial, Department
 
 
+# Separator between subject tags, swallowing the whitespace around each comma
+_TAG_SPLIT = re.compile(r'\s*,\s*')
+
+
 class StudyMaterialUploadForm(forms.ModelForm):
     """Form for uploading study materials."""
     subject_tags = forms.CharField(
@@ -40,36 +46,21 @@ class StudyMaterialUploadForm(forms.ModelForm):
     
     def clean_subject_tags(self):
         """Parse comma-separated tags into a list."""
-        # Get the value from cleaned_data (already cleaned by base CharField)
+        # The base CharField has already stripped outer whitespace
         tags_str = self.cleaned_data.get('subject_tags', '')
-        
-        # If empty or None, return empty list
-        if not tags_str:
-            return []
-        
-        # If it's already a list (shouldn't happen, but handle it), return as is
-        if isinstance(tags_str, list):
-            return tags_str
-        
-        # Ensure it's a string before splitting
-        if not isinstance(tags_str, str):
-            return []
-        
-        # Split by comma, strip whitespace, filter out empty strings
-        tags = [tag.strip() for tag in tags_str.split(',') if tag.strip()]
-        return tags
+        return [tag for tag in _TAG_SPLIT.split(tags_str) if tag]
     
     def save(self, commit: bool = True) -> StudyMaterial:
-        """Save the form and convert subject_tags to list."""
+        """Save the form, writing only the changed columns when editing."""
         instance = super().save(commit=False)
-        # Get the cleaned subject_tags (already converted to list by clean_subject_tags)
-        tags = self.cleaned_data.get('subject_tags', [])
-        # Ensure it's a list
-        if not isinstance(tags, list):
-            tags = []
-        instance.subject_tags = tags
         if commit:
-            instance.save()
+            if instance.pk:
+                # subject_tags is compared as text against the stored list, so
+                # always write it rather than trust changed_data for it
+                instance.save(update_fields=[*self.changed_data, 'subject_tags'])
+            else:
+                instance.save()
+            self._save_m2m()
         return instance
 
 
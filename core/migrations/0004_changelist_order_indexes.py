@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-15 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_studymaterial_favorites_count_recentlyviewedmaterial_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='studymaterial',
+            name='core_studym_verific_9b5590_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='uploadaudit',
+            name='core_upload_materia_2e8e2c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['sent_status', '-created_at'], name='core_notifi_sent_st_57ffd9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studymaterial',
+            index=models.Index(fields=['department', '-uploaded_at'], name='core_studym_departm_3e96a1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studymaterial',
+            index=models.Index(fields=['verification_status', '-uploaded_at'], name='core_studym_verific_d1c148_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadaudit',
+            index=models.Index(fields=['material', '-timestamp'], name='core_upload_materia_fe9eb4_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0 on 2026-10-15 21:58
+
+import core.models
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count, Min
+from django.db.models.functions import Lower
+
+
+def normalize_faculty_emails(apps, schema_editor):
+    """Lower-case stored faculty emails and turn blanks into NULL before they become unique."""
+    Faculty = apps.get_model('core', 'Faculty')
+    Faculty.objects.filter(contact_email='').update(contact_email=None)
+    Faculty.objects.exclude(contact_email=None).update(contact_email=Lower('contact_email'))
+
+    # Faculty sharing an address (e.g. an office mailbox) keep it on the
+    # earliest row only; the others are cleared so the column can be unique
+    shared = (
+        Faculty.objects.exclude(contact_email=None)
+        .values('contact_email')
+        .annotate(rows=Count('pk'), keep_pk=Min('pk'))
+        .filter(rows__gt=1)
+    )
+    for entry in list(shared):
+        Faculty.objects.filter(contact_email=entry['contact_email']).exclude(
+            pk=entry['keep_pk']
+        ).update(contact_email=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0004_changelist_order_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', core.models.UserManager()),
+            ],
+        ),
+        migrations.RunPython(normalize_faculty_emails, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='faculty',
+            name='contact_email',
+            field=models.EmailField(blank=True, help_text='Contact email address', max_length=254, null=True, unique=True, verbose_name='Contact Email'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='user_email_lower'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0 on 2026-10-15 21:59
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_normalize_contact_emails'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='department',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='studymaterial',
+            name='uploaded_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), verbose_name='Uploaded At'),
+        ),
+        migrations.AlterField(
+            model_name='uploadaudit',
+            name='timestamp',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), verbose_name='Timestamp'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), verbose_name='Created At'),
+        ),
+    ]
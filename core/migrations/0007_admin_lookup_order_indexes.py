@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-15 22:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0006_database_default_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studymaterial',
+            index=models.Index(fields=['-uploaded_at'], name='core_studym_uploade_8d24d7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-created_at'], name='core_user_created_51fdf1_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-15 22:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_admin_lookup_order_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='studymaterial',
+            constraint=models.CheckConstraint(check=models.Q(('semester__gte', 1), ('semester__lte', 12)), name='studymaterial_semester_range', violation_error_message='Semester must be between 1 and 12.'),
+        ),
+        migrations.AddConstraint(
+            model_name='timetableentry',
+            constraint=models.CheckConstraint(check=models.Q(('end_time__gt', models.F('start_time'))), name='timetableentry_end_after_start', violation_error_message='End time must be after start time.'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0 on 2026-10-15 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_check_constraints'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studymaterial',
+            index=models.Index(fields=['department', 'verification_status', '-uploaded_at'], name='core_studym_departm_396129_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timetableentry',
+            index=models.Index(fields=['department', 'date', 'start_time'], name='core_timeta_departm_0310fe_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-15 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_list_view_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchquerylog',
+            index=models.Index(fields=['query', 'timestamp'], name='core_search_query_9c436c_idx'),
+        ),
+    ]
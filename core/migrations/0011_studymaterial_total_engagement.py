@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-15 22:09
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_search_query_log_query_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studymaterial',
+            name='total_engagement',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('downloads_count'), '+', models.F('views_count')), '+', django.db.models.expressions.CombinedExpression(models.F('favorites_count'), '*', models.Value(2))), help_text='Downloads + views + favorites (weighted 2x), kept up to date by the database', output_field=models.PositiveIntegerField(), verbose_name='Total Engagement'),
+        ),
+        migrations.AddIndex(
+            model_name='studymaterial',
+            index=models.Index(fields=['-total_engagement', '-downloads_count', '-views_count', '-favorites_count'], name='core_studym_total_e_e0213d_idx'),
+        ),
+    ]
@@ -1,9 +1,25 @@
 """
 Core models for campus_hub application.
 """
-from django.contrib.auth.models import AbstractUser
-from django.db import models
-from django.utils import timezone
+import hashlib
+
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
+from django.core.cache import cache
+from django.db import connection, models
+from django.db.models.functions import Lower, Now
+from django.utils.functional import cached_property
+
+from .batching import BatchWriter
+
+
+class UserManager(BaseUserManager):
+    """Manager for User that resolves logins by case-insensitive email."""
+
+    def get_by_natural_key(self, username):
+        # Matches the Lower('email') unique constraint declared on User.Meta
+        return self.alias(email_lower=Lower(self.model.USERNAME_FIELD)).get(
+            email_lower=username.lower()
+        )
 
 
 class User(AbstractUser):
@@ -18,6 +34,7 @@ class User(AbstractUser):
         ('authority', 'Authority'),
         ('moderator', 'Moderator'),
     ]
+    _ROLE_DISPLAY = dict(ROLE_CHOICES)
     
     name = models.CharField(
         max_length=150,
@@ -57,20 +74,41 @@ class User(AbstractUser):
         help_text='Your WhatsApp number'
     )
     created_at = models.DateTimeField(
-        default=timezone.now,
+        db_default=Now(),
         verbose_name='Created At'
     )
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['name', 'username']
     
+    objects = UserManager()
+    
     class Meta:
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+        ]
+        constraints = [
+            # Logins match email case-insensitively, so it must be unique that way
+            models.UniqueConstraint(
+                Lower('email'),
+                name='user_email_lower',
+                violation_error_message='A user with that email address already exists.',
+            ),
+        ]
     
     def __str__(self) -> str:
         return f"{self.name} ({self.email})"
+    
+    def get_role_display(self) -> str:
+        return self._ROLE_DISPLAY.get(self.role, self.role)
+    
+    @cached_property
+    def is_verifier(self) -> bool:
+        """Whether the user may moderate materials, resolved once per instance."""
+        return self.is_staff or self.is_superuser or self.coordinator_roles.exists()
 
 
 class Department(models.Model):
@@ -99,7 +137,7 @@ class Department(models.Model):
         help_text='List of contact email addresses for the department'
     )
     created_at = models.DateTimeField(
-        default=timezone.now,
+        db_default=Now(),
         verbose_name='Created At'
     )
     
@@ -159,6 +197,7 @@ class Faculty(models.Model):
         help_text='Research interests and areas of expertise'
     )
     contact_email = models.EmailField(
+        unique=True,
         blank=True,
         null=True,
         verbose_name='Contact Email',
@@ -195,6 +234,11 @@ class Faculty(models.Model):
     
     def __str__(self) -> str:
         return f"{self.name} - {self.department.short_code}"
+    
+    def save(self, *args, **kwargs):
+        """Store the contact email lower-cased, or NULL when blank."""
+        self.contact_email = self.contact_email.lower() if self.contact_email else None
+        super().save(*args, **kwargs)
 
 
 class StudyMaterial(models.Model):
@@ -204,12 +248,14 @@ class StudyMaterial(models.Model):
         ('video', 'Video'),
         ('link', 'Link'),
     ]
+    _FILE_TYPE_DISPLAY = dict(FILE_TYPE_CHOICES)
     
     VERIFICATION_STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('approved', 'Approved'),
         ('rejected', 'Rejected'),
     ]
+    _VERIFICATION_STATUS_DISPLAY = dict(VERIFICATION_STATUS_CHOICES)
     
     department = models.ForeignKey(
         Department,
@@ -276,7 +322,7 @@ class StudyMaterial(models.Model):
         verbose_name='Verifier'
     )
     uploaded_at = models.DateTimeField(
-        default=timezone.now,
+        db_default=Now(),
         verbose_name='Uploaded At'
     )
     verified_at = models.DateTimeField(
@@ -301,19 +347,54 @@ class StudyMaterial(models.Model):
         verbose_name='Favorites Count',
         help_text='Number of users who favorited this material'
     )
+    total_engagement = models.GeneratedField(
+        expression=(
+            models.F('downloads_count') + models.F('views_count') + models.F('favorites_count') * 2
+        ),
+        output_field=models.PositiveIntegerField(),
+        db_persist=True,
+        verbose_name='Total Engagement',
+        help_text='Downloads + views + favorites (weighted 2x), kept up to date by the database'
+    )
     
     class Meta:
         verbose_name = 'Study Material'
         verbose_name_plural = 'Study Materials'
         ordering = ['-uploaded_at']
         indexes = [
+            models.Index(fields=['-uploaded_at']),
             models.Index(fields=['department', 'semester', 'year']),
-            models.Index(fields=['verification_status']),
+            models.Index(fields=['department', '-uploaded_at']),
+            models.Index(fields=['verification_status', '-uploaded_at']),
+            models.Index(fields=['department', 'verification_status', '-uploaded_at']),
             models.Index(fields=['uploader_user']),
+            models.Index(
+                fields=['-total_engagement', '-downloads_count', '-views_count', '-favorites_count']
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(semester__gte=1) & models.Q(semester__lte=12),
+                name='studymaterial_semester_range',
+                violation_error_message='Semester must be between 1 and 12.',
+            ),
         ]
     
     def __str__(self) -> str:
         return f"{self.title} - {self.department.short_code}"
+    
+    @classmethod
+    def bump(cls, pk, field: str, amount: int = 1) -> int:
+        """Atomically add ``amount`` to a counter column; returns the rows updated."""
+        return cls.objects.filter(pk=pk).update(**{field: models.F(field) + amount})
+    
+    def get_file_type_display(self) -> str:
+        return self._FILE_TYPE_DISPLAY.get(self.file_type, self.file_type)
+    
+    def get_verification_status_display(self) -> str:
+        return self._VERIFICATION_STATUS_DISPLAY.get(
+            self.verification_status, self.verification_status
+        )
 
 
 class UploadAudit(models.Model):
@@ -348,7 +429,7 @@ class UploadAudit(models.Model):
         help_text='Reason for the action'
     )
     timestamp = models.DateTimeField(
-        default=timezone.now,
+        db_default=Now(),
         verbose_name='Timestamp'
     )
     
@@ -357,7 +438,7 @@ class UploadAudit(models.Model):
         verbose_name_plural = 'Upload Audits'
         ordering = ['-timestamp']
         indexes = [
-            models.Index(fields=['material', 'timestamp']),
+            models.Index(fields=['material', '-timestamp']),
             models.Index(fields=['uploader', 'timestamp']),
         ]
     
@@ -425,8 +506,16 @@ class TimetableEntry(models.Model):
         ordering = ['date', 'start_time']
         indexes = [
             models.Index(fields=['department', 'semester', 'date']),
+            models.Index(fields=['department', 'date', 'start_time']),
             models.Index(fields=['date', 'start_time']),
         ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(end_time__gt=models.F('start_time')),
+                name='timetableentry_end_after_start',
+                violation_error_message='End time must be after start time.',
+            ),
+        ]
     
     def __str__(self) -> str:
         return f"{self.course_code} - {self.date} {self.start_time}"
@@ -489,7 +578,7 @@ class Notification(models.Model):
         verbose_name='Sent Status'
     )
     created_at = models.DateTimeField(
-        default=timezone.now,
+        db_default=Now(),
         verbose_name='Created At'
     )
     
@@ -499,6 +588,7 @@ class Notification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['department', 'sent_status']),
+            models.Index(fields=['sent_status', '-created_at']),
             models.Index(fields=['scheduled_for', 'sent_status']),
             models.Index(fields=['created_by']),
         ]
@@ -514,6 +604,7 @@ class Coordinator(models.Model):
         ('cr', 'Class Representative'),
         ('coordinator', 'Coordinator'),
     ]
+    _ROLE_DISPLAY = dict(ROLE_CHOICES)
     
     user = models.ForeignKey(
         'User',
@@ -550,6 +641,13 @@ class Coordinator(models.Model):
     
     def __str__(self) -> str:
         return f"{self.user.name} - {self.get_role_display()} ({self.department.short_code})"
+    
+    def get_role_display(self) -> str:
+        return self._ROLE_DISPLAY.get(self.role, self.role)
+
+
+# Window within which identical searches by the same user are logged once
+SEARCH_LOG_DEDUPE_SECONDS = 60
 
 
 class SearchQueryLog(models.Model):
@@ -580,11 +678,28 @@ class SearchQueryLog(models.Model):
         indexes = [
             models.Index(fields=['-timestamp']),
             models.Index(fields=['user', '-timestamp']),
+            # Covers the per-query GROUP BY with COUNT and MAX(timestamp)
+            models.Index(fields=['query', 'timestamp']),
         ]
     
     def __str__(self) -> str:
         user_str = self.user.name if self.user else 'Anonymous'
         return f"{self.query} - {user_str} ({self.timestamp})"
+    
+    @classmethod
+    def record(cls, query: str, user=None) -> None:
+        """Log a search without blocking the caller; rows are inserted in batches."""
+        user_id = user.pk if user else None
+        # Repeats of the same search by the same user within the window are
+        # logged once; anonymous visitors cannot be told apart, so each counts
+        if user_id is not None:
+            digest = hashlib.blake2b(f"{user_id}:{query}".encode(), digest_size=16).hexdigest()
+            if not cache.add(f"search_log:{digest}", 1, SEARCH_LOG_DEDUPE_SECONDS):
+                return
+        _search_log_writer.add(cls(query=query, user_id=user_id))
+
+
+_search_log_writer = BatchWriter(SearchQueryLog)
 
 
 class UserFavoriteMaterial(models.Model):
@@ -658,4 +773,18 @@ class RecentlyViewedMaterial(models.Model):
     
     def __str__(self) -> str:
         return f"{self.user.name} viewed {self.material.title} at {self.last_viewed_at}"
+    
+    @classmethod
+    def touch(cls, user, material) -> None:
+        """Record that ``user`` viewed ``material`` with a single upsert."""
+        # MySQL upserts on any unique key and rejects an explicit conflict target
+        unique_fields = None
+        if connection.features.supports_update_conflicts_with_target:
+            unique_fields = ['user', 'material']
+        cls.objects.bulk_create(
+            [cls(user=user, material=material)],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=['last_viewed_at'],
+        )
 
@@ -0,0 +1,112 @@
+"""
+Paginators for core app.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+# Below this many rows the catalog estimate is too coarse to show and an
+# exact COUNT(*) is cheap anyway.
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+def estimated_row_count(model, using: str = 'default') -> int | None:
+    """Return the database's own row estimate for a model's table, if any."""
+    connection = connections[using]
+    if connection.vendor == 'mysql':
+        sql = (
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+        )
+    elif connection.vendor == 'postgresql':
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s"
+    else:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that skips COUNT(*) on large, unfiltered tables.
+
+    When the queryset has no WHERE clause the table statistics describe it
+    exactly enough for paging, so they are used instead of a full count.
+    Filtered querysets and small tables still get an exact count.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_row_count(self.object_list.model, self.object_list.db)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class KeysetPaginator(EstimatedCountPaginator):
+    """
+    Paginator that seeks deep pages by key instead of reading past OFFSET rows.
+
+    When the queryset is ordered by a single non-null column plus the primary
+    key in the same direction, the first key of the requested page is read
+    through the column's index alone and the page rows are then fetched with
+    a range condition on that key. Any other ordering falls back to OFFSET.
+    """
+
+    def page(self, number):
+        number = self.validate_number(number)
+        keyset = self._keyset()
+        if number == 1 or keyset is None:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+
+        field, descending = keyset
+        boundary = list(self.object_list.values_list(field, 'pk')[bottom:bottom + 1])
+        if not boundary:
+            return self._get_page(self.object_list.none(), number, self)
+        value, pk = boundary[0]
+        if descending:
+            seek = Q(**{f'{field}__lte': value}) & ~Q(**{field: value, 'pk__gt': pk})
+        else:
+            seek = Q(**{f'{field}__gte': value}) & ~Q(**{field: value, 'pk__lt': pk})
+        return self._get_page(self.object_list.filter(seek)[:top - bottom], number, self)
+
+    def _keyset(self) -> tuple[str, bool] | None:
+        """Return ``(field, descending)`` if the ordering can be seeked."""
+        query = getattr(self.object_list, 'query', None)
+        if query is None:
+            return None
+        # The admin can repeat its default ordering ahead of the pk tie-breaker
+        order_by = list(dict.fromkeys(query.order_by))
+        if len(order_by) != 2:
+            return None
+        first, second = order_by
+        if not isinstance(first, str) or not isinstance(second, str):
+            return None
+
+        descending = first.startswith('-')
+        field = first.lstrip('-')
+        opts = self.object_list.model._meta
+        if second.lstrip('-') not in ('pk', opts.pk.name) or second.startswith('-') != descending:
+            return None
+        try:
+            model_field = opts.get_field(field)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.is_relation or model_field.null:
+            return None
+        return field, descending
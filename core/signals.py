@@ -0,0 +1,22 @@
+"""
+Signal handlers for core app.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_departments, invalidate_recent_materials
+from .models import Department, StudyMaterial
+
+
+@receiver([post_save, post_delete], sender=Department)
+def clear_department_cache(sender, **kwargs):
+    """Drop the cached department list whenever a department changes."""
+    invalidate_departments()
+    # The cached home page materials carry their department's short code
+    invalidate_recent_materials()
+
+
+@receiver([post_save, post_delete], sender=StudyMaterial)
+def clear_recent_materials_cache(sender, **kwargs):
+    """Drop the cached home page materials whenever a material changes."""
+    invalidate_recent_materials()
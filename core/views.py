@@ -1,6 +1,9 @@
 """
 Views for core app.
 """
+from datetime import date, timedelta
+from functools import wraps
+
 from django.views.generic import TemplateView, ListView, DetailView, CreateView
 from django.views.generic.edit import FormMixin
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
@@ -8,15 +11,58 @@ from django.contrib.auth.views import redirect_to_login
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy, reverse
 from django.utils import timezone
+from django.db import transaction
+from django.db.models import Prefetch
 from django.http import HttpResponseForbidden
+from django.utils.decorators import method_decorator
 from django.views import View
-from django.db.models import F
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
 
 from .models import (
     Department, Faculty, StudyMaterial, UploadAudit, 
     TimetableEntry, SearchQueryLog, UserFavoriteMaterial, RecentlyViewedMaterial
 )
 from .forms import StudyMaterialUploadForm, StudyMaterialModerationForm
+from .paginators import EstimatedCountPaginator
+from .cache import (
+    get_departments_cached, get_recent_approved_materials, get_search_top_terms_cached,
+    get_top_materials_cached, recent_materials_queryset,
+)
+
+
+# How long anonymous visitors may be served a cached copy of a public list
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 60
+
+# How far ahead the timetable looks when no date is picked
+UPCOMING_WINDOW = timedelta(days=14)
+
+
+def cache_page_for_anonymous(timeout):
+    """Like cache_page, but signed-in users always get a freshly rendered page."""
+    def decorator(view_func):
+        cached_view = vary_on_cookie(cache_page(timeout)(view_func))
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+            return cached_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_favorite_material_ids(request) -> set:
+    """Return the ids of the materials the current user has favorited, loaded once per request."""
+    if not request.user.is_authenticated:
+        return set()
+    if not hasattr(request, "_favorite_material_ids"):
+        request._favorite_material_ids = set(
+            UserFavoriteMaterial.objects.filter(
+                user=request.user
+            ).order_by().values_list("material_id", flat=True)
+        )
+    return request._favorite_material_ids
 
 
 class HomeView(TemplateView):
@@ -25,25 +71,27 @@ class HomeView(TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["departments"] = Department.objects.all().order_by("name")
+        context["departments"] = get_departments_cached()
         
-        # Filter materials based on user permissions
-        materials_queryset = StudyMaterial.objects.all()
+        # Filter materials based on user permissions; only the public list is cached
         user = self.request.user
-        if not (user.is_staff or user.is_superuser):
-            materials_queryset = materials_queryset.filter(verification_status="approved")
-        
-        context["recent_materials"] = materials_queryset.order_by("-uploaded_at")[:5]
+        if user.is_staff or user.is_superuser:
+            context["recent_materials"] = recent_materials_queryset()[:5]
+        else:
+            context["recent_materials"] = get_recent_approved_materials()
         return context
 
 
+@method_decorator(cache_page_for_anonymous(ANONYMOUS_PAGE_CACHE_TIMEOUT), name="dispatch")
 class DepartmentListView(ListView):
     """List view for all departments."""
     model = Department
     template_name = "core/department_list.html"
     context_object_name = "departments"
     paginate_by = 20
-    ordering = ["name"]
+
+    def get_queryset(self):
+        return get_departments_cached()
 
 
 class DepartmentDetailView(DetailView):
@@ -64,6 +112,7 @@ class DepartmentDetailView(DetailView):
         return context
 
 
+@method_decorator(cache_page_for_anonymous(ANONYMOUS_PAGE_CACHE_TIMEOUT), name="dispatch")
 class FacultyListView(ListView):
     """List view for all faculty with optional department filter."""
     model = Faculty
@@ -74,17 +123,13 @@ class FacultyListView(ListView):
     def get_queryset(self):
         queryset = super().get_queryset()
         department_id = self.request.GET.get("department")
-        if department_id:
-            try:
-                department = get_object_or_404(Department, pk=department_id)
-                queryset = queryset.filter(department=department)
-            except (ValueError, Department.DoesNotExist):
-                pass
+        if department_id and department_id.isdecimal():
+            queryset = queryset.filter(department_id=int(department_id))
         return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["departments"] = Department.objects.all().order_by("name")
+        context["departments"] = get_departments_cached()
         return context
 
 
@@ -101,10 +146,26 @@ class StudyMaterialListView(ListView):
     template_name = "core/study_material_list.html"
     context_object_name = "materials"
     ordering = ["-uploaded_at"]
+    paginate_by = 25
+    paginator_class = EstimatedCountPaginator
+
+    def dispatch(self, request, *args, **kwargs):
+        # Log outside the page cache so cached responses still count as searches
+        if request.method in ("GET", "HEAD"):
+            self.record_search()
+        return self.cached_dispatch(request, *args, **kwargs)
+
+    @method_decorator(cache_page_for_anonymous(ANONYMOUS_PAGE_CACHE_TIMEOUT))
+    def cached_dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
         """Filter queryset based on query parameters and user permissions."""
-        queryset = super().get_queryset()
+        # Only the columns the list template renders
+        queryset = super().get_queryset().select_related("department").only(
+            "title", "semester", "year", "verification_status", "uploaded_at",
+            "department__short_code",
+        )
 
         # Filter by verification status based on user permissions
         user = self.request.user
@@ -113,12 +174,8 @@ class StudyMaterialListView(ListView):
 
         # Filter by department
         department_id = self.request.GET.get("department")
-        if department_id:
-            try:
-                department = get_object_or_404(Department, pk=department_id)
-                queryset = queryset.filter(department=department)
-            except (ValueError, Department.DoesNotExist):
-                pass
+        if department_id and department_id.isdecimal():
+            queryset = queryset.filter(department_id=int(department_id))
 
         # Filter by semester
         semester = self.request.GET.get("semester")
@@ -136,17 +193,28 @@ class StudyMaterialListView(ListView):
             except (ValueError, TypeError):
                 pass
 
+        return queryset
+
+    def record_search(self) -> None:
+        """Log the applied filters as a search query."""
+        department_id = self.request.GET.get("department")
+        semester = self.request.GET.get("semester")
+        year = self.request.GET.get("year")
+        user = self.request.user
+
         # Track search query if any filters are applied
         has_filters = False
         search_parts = []
 
         if department_id:
             has_filters = True
-            try:
-                dept = Department.objects.get(pk=department_id)
-                search_parts.append(f"department:{dept.short_code}")
-            except (Department.DoesNotExist, ValueError):
-                pass
+            short_code = next(
+                (dept.short_code for dept in get_departments_cached()
+                 if str(dept.pk) == department_id),
+                None,
+            )
+            if short_code:
+                search_parts.append(f"department:{short_code}")
 
         if semester:
             has_filters = True
@@ -157,18 +225,17 @@ class StudyMaterialListView(ListView):
             search_parts.append(f"year:{year}")
 
         # Log search query if filters were applied
-        if has_filters:
+        if has_filters and search_parts:
             query_string = " ".join(search_parts)
-            SearchQueryLog.objects.create(
-                query=query_string,
+            SearchQueryLog.record(
+                query_string,
                 user=user if user.is_authenticated else None
             )
 
-        return queryset
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["departments"] = Department.objects.all().order_by("name")
+        context["departments"] = get_departments_cached()
+        context["favorite_ids"] = get_favorite_material_ids(self.request)
         return context
 
 
@@ -178,12 +245,19 @@ class StudyMaterialDetailView(DetailView):
     template_name = "core/study_material_detail.html"
     context_object_name = "material"
     
+    def get_queryset(self):
+        return super().get_queryset().select_related("department", "uploader_user", "verifier")
+    
     def get_object(self, queryset=None):
         """Get the material object and increment views_count."""
+        # Only the first lookup per request may count as a view
+        if hasattr(self, "_cached_object"):
+            return self._cached_object
         obj = super().get_object(queryset)
-        # Increment views count
+        # Increment views count in the database; mirror it locally for display
+        StudyMaterial.bump(obj.pk, 'views_count')
         obj.views_count += 1
-        obj.save(update_fields=['views_count'])
+        self._cached_object = obj
         return obj
     
     def get_context_data(self, **kwargs):
@@ -193,19 +267,10 @@ class StudyMaterialDetailView(DetailView):
         user = self.request.user
         
         # Check if material is favorited by current user
-        is_favorite = False
+        is_favorite = material.pk in get_favorite_material_ids(self.request)
         if user.is_authenticated:
-            is_favorite = UserFavoriteMaterial.objects.filter(
-                user=user,
-                material=material
-            ).exists()
-            
             # Track recent view
-            RecentlyViewedMaterial.objects.update_or_create(
-                user=user,
-                material=material,
-                defaults={'last_viewed_at': timezone.now()}
-            )
+            RecentlyViewedMaterial.touch(user, material)
         
         context['is_favorite'] = is_favorite
         return context
@@ -226,16 +291,15 @@ class StudyMaterialCreateView(LoginRequiredMixin, CreateView):
         form.instance.verification_status = "pending"
         # uploaded_at will auto-default
 
-        # Save the material
-        response = super().form_valid(form)
-
-        # Create audit entry
-        UploadAudit.objects.create(
-            material=self.object,
-            uploader=self.request.user,
-            action="upload",
-            reason="Initial upload",
-        )
+        # Save the material and its audit entry in one transaction
+        with transaction.atomic():
+            super().form_valid(form)
+            UploadAudit.objects.create(
+                material=self.object,
+                uploader=self.request.user,
+                action="upload",
+                reason="Initial upload",
+            )
 
         # Redirect to the detail page of the created material
         return redirect("material_detail", pk=self.object.pk)
@@ -247,17 +311,8 @@ class StudyMaterialCreateView(LoginRequiredMixin, CreateView):
 
 def is_verifier(user) -> bool:
     """Check if a user is a verifier."""
-    if not user.is_authenticated:
-        return False
-
-    # Handle either default related_name or a custom one
-    has_coordinator = False
-    if hasattr(user, "coordinator_roles"):
-        has_coordinator = user.coordinator_roles.exists()
-    elif hasattr(user, "coordinator_set"):
-        has_coordinator = user.coordinator_set.exists()
-
-    return user.is_staff or user.is_superuser or has_coordinator
+    # The request user is loaded once per request, so this queries at most once
+    return user.is_authenticated and user.is_verifier
 
 
 class StudyMaterialVerifierRequiredMixin(UserPassesTestMixin):
@@ -285,7 +340,10 @@ class StudyMaterialModerationListView(
 
     def get_queryset(self):
         """Filter queryset based on query parameters."""
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related("department", "uploader_user").only(
+            "title", "semester", "year", "verification_status", "uploaded_at",
+            "department__short_code", "uploader_user__name", "uploader_user__email",
+        )
 
         # Filter by status
         status = self.request.GET.get("status", "pending")
@@ -294,18 +352,14 @@ class StudyMaterialModerationListView(
 
         # Filter by department
         department_id = self.request.GET.get("department")
-        if department_id:
-            try:
-                department = get_object_or_404(Department, pk=department_id)
-                queryset = queryset.filter(department=department)
-            except (ValueError, Department.DoesNotExist):
-                pass
+        if department_id and department_id.isdecimal():
+            queryset = queryset.filter(department_id=int(department_id))
 
         return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["departments"] = Department.objects.all().order_by("name")
+        context["departments"] = get_departments_cached()
         context["current_status"] = self.request.GET.get("status", "pending")
         context["current_department_id"] = self.request.GET.get("department", "")
         return context
@@ -324,12 +378,22 @@ class StudyMaterialModerationDetailView(
         """Redirect to moderation list after action."""
         return reverse_lazy("material_moderation_list")
 
+    def get_queryset(self):
+        """Load the material's relations and ordered audit trail up front."""
+        return super().get_queryset().select_related(
+            "department", "uploader_user", "verifier"
+        ).prefetch_related(
+            Prefetch(
+                "audit_logs",
+                queryset=UploadAudit.objects.select_related("uploader").order_by("-timestamp"),
+            )
+        )
+
     def get_context_data(self, **kwargs):
+        # FormMixin already adds the bound or unbound form to the context
         context = super().get_context_data(**kwargs)
-        material = self.get_object()
-        context["audit_logs"] = material.audit_logs.order_by("-timestamp")
+        context["audit_logs"] = self.object.audit_logs.all()
         context["can_approve"] = is_verifier(self.request.user)
-        context["form"] = self.get_form()
         return context
 
     def post(self, request, *args, **kwargs):
@@ -343,7 +407,7 @@ class StudyMaterialModerationDetailView(
 
     def form_valid(self, form):
         """Process the moderation action."""
-        material = self.get_object()
+        material = self.object
         action = form.cleaned_data["action"]
         reason = form.cleaned_data.get("reason", "")
 
@@ -361,19 +425,21 @@ class StudyMaterialModerationDetailView(
             material.verifier = self.request.user
             # verified_at stays None
 
-        material.save()
-
-        # Create audit entry
-        UploadAudit.objects.create(
-            material=material,
-            uploader=self.request.user,
-            action="edit",
-            reason=reason if reason else f"Moderation action: {action}",
-        )
+        # Save the moderation fields and the audit entry in one transaction;
+        # limiting the UPDATE keeps concurrent counter increments intact
+        with transaction.atomic():
+            material.save(update_fields=["verification_status", "verifier", "verified_at"])
+            UploadAudit.objects.create(
+                material=material,
+                uploader=self.request.user,
+                action="edit",
+                reason=reason if reason else f"Moderation action: {action}",
+            )
 
         return redirect(self.get_success_url())
 
 
+@method_decorator(cache_page_for_anonymous(ANONYMOUS_PAGE_CACHE_TIMEOUT), name="dispatch")
 class TimetableListView(ListView):
     """List view for timetable entries with filtering."""
     model = TimetableEntry
@@ -389,12 +455,8 @@ class TimetableListView(ListView):
 
         # Filter by department
         department_id = self.request.GET.get("department")
-        if department_id:
-            try:
-                department = get_object_or_404(Department, pk=department_id)
-                queryset = queryset.filter(department=department)
-            except (ValueError, Department.DoesNotExist):
-                pass
+        if department_id and department_id.isdecimal():
+            queryset = queryset.filter(department_id=int(department_id))
 
         # Filter by semester
         semester = self.request.GET.get("semester")
@@ -408,24 +470,20 @@ class TimetableListView(ListView):
         date_str = self.request.GET.get("date")
         if date_str:
             try:
-                from datetime import datetime
-
-                filter_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+                filter_date = date.fromisoformat(date_str)
                 queryset = queryset.filter(date=filter_date)
             except (ValueError, TypeError):
                 pass
         else:
-            # Default to upcoming entries (next 14 days)
-            from datetime import timedelta
-
-            end_date = today + timedelta(days=14)
+            # Default to upcoming entries
+            end_date = today + UPCOMING_WINDOW
             queryset = queryset.filter(date__gte=today, date__lte=end_date)
 
         return queryset.order_by("date", "start_time")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["departments"] = Department.objects.all().order_by("name")
+        context["departments"] = get_departments_cached()
         context["current_department_id"] = self.request.GET.get("department", "")
         context["current_semester"] = self.request.GET.get("semester", "")
         context["current_date"] = self.request.GET.get("date", "")
@@ -473,13 +531,16 @@ class StudyMaterialDownloadView(DetailView):
     model = StudyMaterial
     context_object_name = "material"
     
+    def get_queryset(self):
+        # The redirect only needs the file reference
+        return super().get_queryset().only("file_drive_id")
+    
     def get(self, request, *args, **kwargs):
         """Increment download count and redirect to file."""
         material = self.get_object()
         
-        # Increment downloads count
-        material.downloads_count += 1
-        material.save(update_fields=['downloads_count'])
+        # Increment downloads count in the database
+        StudyMaterial.bump(material.pk, 'downloads_count')
         
         # Redirect to file_drive_id (Google Drive link or file)
         if material.file_drive_id:
@@ -495,6 +556,7 @@ class StudyMaterialDownloadView(DetailView):
         return redirect('material_detail', pk=material.pk)
 
 
+@method_decorator(cache_page_for_anonymous(ANONYMOUS_PAGE_CACHE_TIMEOUT), name="dispatch")
 class TopMaterialsView(ListView):
     """View showing top materials by downloads and views."""
     model = StudyMaterial
@@ -504,12 +566,7 @@ class TopMaterialsView(ListView):
     
     def get_queryset(self):
         """Get top materials sorted by downloads + views + favorites."""
-        queryset = StudyMaterial.objects.select_related('department').all()
-        # Annotate with total engagement (favorites weighted 2x)
-        queryset = queryset.annotate(
-            total_engagement=F('downloads_count') + F('views_count') + F('favorites_count') * 2
-        ).order_by('-total_engagement', '-downloads_count', '-views_count', '-favorites_count')
-        return queryset[:20]
+        return get_top_materials_cached()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -533,12 +590,7 @@ class SearchAnalyticsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
     
     def get_queryset(self):
         """Get top search queries with counts."""
-        from django.db.models import Count, Max
-        queryset = SearchQueryLog.objects.values('query').annotate(
-            count=Count('id'),
-            last_searched=Max('timestamp')
-        ).order_by('-count', '-last_searched')[:50]
-        return queryset
+        return get_search_top_terms_cached()
 
 
 class ToggleFavoriteView(LoginRequiredMixin, View):
@@ -547,25 +599,17 @@ class ToggleFavoriteView(LoginRequiredMixin, View):
     
     def post(self, request, pk):
         """Toggle favorite status for the material."""
-        material = get_object_or_404(StudyMaterial, pk=pk)
+        material = get_object_or_404(StudyMaterial.objects.only("pk"), pk=pk)
         user = request.user
         
-        # Check if favorite already exists
-        try:
-            favorite = UserFavoriteMaterial.objects.get(user=user, material=material)
-            # Favorite exists, remove it
-            favorite.delete()
-            # Decrement favorites_count (ensure it doesn't go below 0)
-            StudyMaterial.objects.filter(pk=material.pk).update(
-                favorites_count=F('favorites_count') - 1
-            )
-        except UserFavoriteMaterial.DoesNotExist:
-            # Favorite doesn't exist, create it
-            UserFavoriteMaterial.objects.create(user=user, material=material)
-            # Increment favorites_count
-            StudyMaterial.objects.filter(pk=material.pk).update(
-                favorites_count=F('favorites_count') + 1
-            )
+        with transaction.atomic():
+            # Remove the favorite if it exists; the row count says which way to toggle
+            deleted, _ = UserFavoriteMaterial.objects.filter(user=user, material=material).delete()
+            if deleted:
+                StudyMaterial.bump(material.pk, 'favorites_count', -1)
+            else:
+                UserFavoriteMaterial.objects.create(user=user, material=material)
+                StudyMaterial.bump(material.pk, 'favorites_count')
         
         # Redirect back to material detail page
         return redirect('material_detail', pk=material.pk)
@@ -574,6 +618,11 @@ class ToggleFavoriteView(LoginRequiredMixin, View):
 class MyLibraryView(LoginRequiredMixin, TemplateView):
     """View showing user's favorite and recently viewed materials."""
     template_name = "core/my_library.html"
+    # Material columns rendered for each library entry
+    material_fields = (
+        'material__title', 'material__semester', 'material__uploaded_at',
+        'material__verification_status', 'material__department__short_code',
+    )
     
     def get_context_data(self, **kwargs):
         """Get favorites and recent views for the current user."""
@@ -586,12 +635,16 @@ class MyLibraryView(LoginRequiredMixin, TemplateView):
         # Get favorites
         favorites_qs = UserFavoriteMaterial.objects.filter(
             user=user
-        ).select_related('material', 'material__department').order_by('-created_at')
+        ).select_related('material', 'material__department').only(
+            *self.material_fields
+        ).order_by('-created_at')
         
         # Get recent views
         recent_qs = RecentlyViewedMaterial.objects.filter(
             user=user
-        ).select_related('material', 'material__department').order_by('-last_viewed_at')
+        ).select_related('material', 'material__department').only(
+            'last_viewed_at', *self.material_fields
+        ).order_by('-last_viewed_at')
         
         # Apply visibility rules for non-staff users
         if not is_verifier_user: